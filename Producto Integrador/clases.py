@@ -1,7 +1,16 @@
 """Clases basicas del simulador"""
 
 from enum import Enum
-from collections import OrderedDict, deque
+from collections import OrderedDict, defaultdict, deque
+from itertools import islice
+
+# TLB por proceso: mapeo directo por los bits bajos del numero de pagina
+TLB_SIZE = 16
+TLB_MASK = TLB_SIZE - 1
+TLB_EMPTY = (None, None)
+
+# Eventos de semaforo que se conservan para el historial
+SEMAPHORE_HISTORY_SIZE = 256
 
 class ProcessState(Enum):
     """Estados del proceso"""
@@ -12,6 +21,9 @@ class ProcessState(Enum):
     WAITING = "En Espera"
     TERMINATED = "Terminado"
 
+# Estados en los que un proceso no compite por recursos
+INACTIVE_STATES = frozenset((ProcessState.TERMINATED, ProcessState.NEW))
+
 class TerminationCause(Enum):
     """Causas de terminacion de un proceso"""
     COMPLETED = "Finalizo su ejecucion"
@@ -22,13 +34,20 @@ class TerminationCause(Enum):
 
 class Process:
     """Representa un proceso con gestion completa"""
+    __slots__ = ('pid', 'size_kb', 'num_pages', 'state', 'priority',
+                 'pages_in_ram', 'pages_in_swap', 'page_faults', 'tlb',
+                 'cpu_burst', 'remaining_cpu', 'arrival_time', 'start_time',
+                 'finish_time', 'waiting_time', 'turnaround_time', 'ready_since',
+                 'lifetime', 'remaining_lifetime',
+                 'blocked_on', 'waiting_for', 'termination_cause', 'role')
     _counter = 0
+    page_kb = 256  # Tamano de pagina (KB), lo fija ProcessManager al iniciar
     
     def __init__(self, size_kb, lifetime, priority=5, cpu_burst=None):
         Process._counter += 1
         self.pid = Process._counter
         self.size_kb = size_kb
-        self.num_pages = 0
+        self.num_pages = -(-size_kb // Process.page_kb)
         self.state = ProcessState.NEW
         self.priority = priority
         
@@ -36,7 +55,7 @@ class Process:
         self.pages_in_ram = set()
         self.pages_in_swap = set()
         self.page_faults = 0
-        self.last_access_time = {}
+        self.tlb = [TLB_EMPTY] * TLB_SIZE
         
         # Gestion de CPU
         self.cpu_burst = cpu_burst or lifetime
@@ -46,6 +65,7 @@ class Process:
         self.finish_time = None
         self.waiting_time = 0
         self.turnaround_time = 0
+        self.ready_since = None
         
         # Ciclo de vida
         self.lifetime = lifetime
@@ -58,15 +78,30 @@ class Process:
         # Terminacion
         self.termination_cause = None
         
+        # Rol en demos (ej. Productor/Consumidor)
+        self.role = None
+        
     def __str__(self):
         return f"P{self.pid}"
     
     def is_active(self):
         """Verifica si el proceso esta activo"""
-        return self.state not in [ProcessState.TERMINATED, ProcessState.NEW]
+        return self.state not in INACTIVE_STATES
+    
+    def tlb_invalidate(self, page_num):
+        """Invalida la linea del TLB de una pagina que sale de RAM"""
+        slot = page_num & TLB_MASK
+        if self.tlb[slot][0] == page_num:
+            self.tlb[slot] = TLB_EMPTY
+    
+    def tlb_flush(self):
+        """Vacia el TLB completo"""
+        self.tlb = [TLB_EMPTY] * TLB_SIZE
 
 class PageTableEntry:
     """Entrada de tabla de paginas"""
+    __slots__ = ('page_num', 'frame', 'swap_loc', 'in_ram', 'last_access', 'dirty')
+    
     def __init__(self, page_num):
         self.page_num = page_num
         self.frame = None
@@ -77,24 +112,30 @@ class PageTableEntry:
 
 class PageTable:
     """Tabla de paginas de un proceso"""
+    __slots__ = ('pid', 'entries')
+    
     def __init__(self, pid, num_pages):
         self.pid = pid
-        self.entries = {i: PageTableEntry(i) for i in range(num_pages)}
+        # Paginas densas 0..num_pages-1: la lista se indexa por numero de pagina
+        self.entries = [PageTableEntry(i) for i in range(num_pages)]
     
     def get(self, page_num):
-        return self.entries.get(page_num)
+        if 0 <= page_num < len(self.entries):
+            return self.entries[page_num]
+        return None
     
     def translate(self, page_num):
         """Traduce pagina a marco. Retorna (marco, page_fault)"""
-        entry = self.get(page_num)
-        if not entry:
-            return None, True
-        if entry.in_ram:
-            return entry.frame, False
+        if 0 <= page_num < len(self.entries):
+            entry = self.entries[page_num]
+            if entry.in_ram:
+                return entry.frame, False
         return None, True
 
 class CPU:
     """Recurso CPU"""
+    __slots__ = ('current_process', 'idle_time', 'busy_time', 'context_switches')
+    
     def __init__(self):
         self.current_process = None
         self.idle_time = 0
@@ -116,7 +157,8 @@ class CPU:
     
     def release(self):
         """Libera la CPU"""
-        if self.current_process:
+        # Solo un proceso en ejecucion vuelve a listo; bloqueado o terminado conserva su estado
+        if self.current_process and self.current_process.state is ProcessState.RUNNING:
             self.current_process.state = ProcessState.READY
         self.current_process = None
     
@@ -136,11 +178,32 @@ class CPU:
 
 class Semaphore:
     """Semaforo para sincronizacion"""
-    def __init__(self, name, initial_value=1):
+    __slots__ = ('name', 'value', 'waiting_queue', 'retry_queue', 'history', 'mutex', 'holders')
+    
+    _EVENT_TEXT = {
+        'block': "bloqueado en",
+        'acquire': "adquirio",
+        'unblock': "desbloqueado de",
+        'release': "libero",
+    }
+    
+    def __init__(self, name, initial_value=1, mutex=False, history_size=SEMAPHORE_HISTORY_SIZE):
         self.name = name
         self.value = initial_value
         self.waiting_queue = deque()
-        self.history = []
+        # Procesos que esperan unidades sin haber reservado ninguna (acquire_all):
+        # al despertar no reciben la unidad y reintentan el conjunto completo
+        self.retry_queue = deque()
+        self.history = deque(maxlen=history_size)
+        # Solo un mutex tiene dueno: en un semaforo contador (empty/full)
+        # quien hace wait no es quien hace signal, aunque empiece en 1
+        self.mutex = mutex
+        # pid -> unidades adquiridas y aun no liberadas (solo si es mutex)
+        self.holders = {}
+    
+    def _hold(self, pid):
+        if self.mutex:
+            self.holders[pid] = self.holders.get(pid, 0) + 1
     
     def wait(self, process):
         """Operacion Wait (P)"""
@@ -149,29 +212,60 @@ class Semaphore:
             process.state = ProcessState.BLOCKED
             process.blocked_on = self.name
             self.waiting_queue.append(process)
-            self.history.append(f"P{process.pid} bloqueado en {self.name}")
+            self.history.append(('block', process.pid))
             return False
-        self.history.append(f"P{process.pid} adquirio {self.name}")
+        self._hold(process.pid)
+        self.history.append(('acquire', process.pid))
         return True
     
+    def block_until_available(self, process):
+        """Bloquea al proceso hasta el proximo signal, sin reservar unidad"""
+        process.state = ProcessState.BLOCKED
+        process.blocked_on = self.name
+        self.retry_queue.append(process)
+        self.history.append(('block', process.pid))
+    
     def signal(self, process=None):
         """Operacion Signal (V)"""
         self.value += 1
+        if process and process.pid in self.holders:
+            self.holders[process.pid] -= 1
+            if not self.holders[process.pid]:
+                del self.holders[process.pid]
         if self.waiting_queue:
             blocked_process = self.waiting_queue.popleft()
             blocked_process.state = ProcessState.READY
             blocked_process.blocked_on = None
-            self.history.append(f"P{blocked_process.pid} desbloqueado de {self.name}")
+            self._hold(blocked_process.pid)
+            self.history.append(('unblock', blocked_process.pid))
             return blocked_process
+        if self.retry_queue:
+            # La unidad queda disponible para el reintento del proceso
+            retry_process = self.retry_queue.popleft()
+            retry_process.state = ProcessState.READY
+            retry_process.blocked_on = None
+            self.history.append(('unblock', retry_process.pid))
+            return retry_process
         if process:
-            self.history.append(f"P{process.pid} libero {self.name}")
+            self.history.append(('release', process.pid))
         return None
+    
+    def formatted_history(self, last=None):
+        """Genera el historial como texto legible (solo los ultimos `last` eventos si se indica)"""
+        events = self.history
+        if last is not None:
+            # Tomar la cola desde el final sin copiar todo el historial
+            events = reversed(list(islice(reversed(events), last)))
+        for op, pid in events:
+            yield f"P{pid} {self._EVENT_TEXT[op]} {self.name}"
 
 class SharedMemory:
     """Memoria compartida entre procesos"""
+    __slots__ = ('name', 'buffer', 'max_size', 'readers', 'writers')
+    
     def __init__(self, name, size=10):
         self.name = name
-        self.buffer = []
+        self.buffer = deque()
         self.max_size = size
         self.readers = 0
         self.writers = 0
@@ -186,7 +280,7 @@ class SharedMemory:
     def read(self, process):
         """Lee de memoria compartida"""
         if self.buffer:
-            return self.buffer.pop(0)
+            return self.buffer.popleft()
         return None
     
     def is_full(self):
@@ -197,36 +291,57 @@ class SharedMemory:
 
 class SwapManager:
     """Gestor del area de intercambio"""
+    __slots__ = ('total_frames', 'pids', 'pages', 'used', 'swaps_in', 'swaps_out',
+                 '_free', '_by_pid')
+    
     def __init__(self, total_kb, page_kb):
         self.total_frames = total_kb // page_kb
-        self.frames = [None] * self.total_frames
+        # Columnas paralelas por frame: pid dueno y pagina guardada
+        self.pids = [None] * self.total_frames
+        self.pages = [None] * self.total_frames
         self.used = 0
         self.swaps_in = 0
         self.swaps_out = 0
+        
+        # Indices libres y frames por proceso (evitan recorrer todo el swap)
+        self._free = deque(range(self.total_frames))
+        self._by_pid = defaultdict(set)
     
     def allocate(self, pid, page_num):
         """Asigna un frame en swap"""
-        for i in range(self.total_frames):
-            if self.frames[i] is None:
-                self.frames[i] = (pid, page_num)
-                self.used += 1
-                self.swaps_in += 1
-                return i
-        return None
+        if not self._free:
+            return None
+        i = self._free.popleft()
+        self.pids[i] = pid
+        self.pages[i] = page_num
+        self._by_pid[pid].add(i)
+        self.used += 1
+        self.swaps_in += 1
+        return i
     
     def free(self, swap_idx):
         """Libera un frame del swap"""
-        if 0 <= swap_idx < self.total_frames and self.frames[swap_idx]:
-            self.frames[swap_idx] = None
+        if 0 <= swap_idx < self.total_frames and self.pids[swap_idx] is not None:
+            pid = self.pids[swap_idx]
+            self.pids[swap_idx] = None
+            self.pages[swap_idx] = None
+            self._free.append(swap_idx)
+            owned = self._by_pid.get(pid)
+            if owned is not None:
+                owned.discard(swap_idx)
+                if not owned:
+                    del self._by_pid[pid]
             self.used -= 1
             self.swaps_out += 1
     
     def free_process(self, pid):
         """Libera todas las paginas de un proceso"""
-        for i in range(self.total_frames):
-            if self.frames[i] and self.frames[i][0] == pid:
-                self.frames[i] = None
-                self.used -= 1
+        owned = self._by_pid.pop(pid, ())
+        for i in owned:
+            self.pids[i] = None
+            self.pages[i] = None
+        self._free.extend(owned)
+        self.used -= len(owned)
     
     def get_utilization(self):
         return (self.used / self.total_frames * 100) if self.total_frames > 0 else 0
@@ -236,6 +351,12 @@ class SwapManager:
 
 class Statistics:
     """Estadisticas del sistema"""
+    __slots__ = ('total_processes', 'completed_processes', 'rejected_processes',
+                 'forced_terminations', 'total_page_faults', 'memory_accesses',
+                 'total_swaps', 'avg_waiting_time', 'avg_turnaround_time',
+                 'avg_response_time', 'deadlocks_detected', 'total_blocks',
+                 '_sum_waiting', '_sum_turnaround', '_finished')
+    
     def __init__(self):
         # Procesos
         self.total_processes = 0
@@ -252,6 +373,9 @@ class Statistics:
         self.avg_waiting_time = 0
         self.avg_turnaround_time = 0
         self.avg_response_time = 0
+        self._sum_waiting = 0
+        self._sum_turnaround = 0
+        self._finished = 0
         
         # Sincronizacion
         self.deadlocks_detected = 0
@@ -262,11 +386,16 @@ class Statistics:
             return 0.0
         return (self.total_page_faults / self.memory_accesses) * 100
     
-    def calculate_cpu_metrics(self, processes):
+    def record_finished(self, process):
+        """Acumula los tiempos de un proceso que acaba de terminar"""
+        self._sum_waiting += process.waiting_time
+        self._sum_turnaround += process.turnaround_time
+        self._finished += 1
+    
+    def calculate_cpu_metrics(self):
         """Calcula metricas de CPU"""
-        finished = [p for p in processes if p.finish_time is not None]
-        if not finished:
+        if not self._finished:
             return
         
-        self.avg_waiting_time = sum(p.waiting_time for p in finished) / len(finished)
-        self.avg_turnaround_time = sum(p.turnaround_time for p in finished) / len(finished)
+        self.avg_waiting_time = self._sum_waiting / self._finished
+        self.avg_turnaround_time = self._sum_turnaround / self._finished
@@ -3,9 +3,18 @@
 import configparser
 import logging
 import os
+import random
+import sys
+from collections import OrderedDict, deque
+from itertools import islice
 from clases import *
 from planificador_fcfs import FCFSScheduler
 
+# Separadores y encabezados de la visualizacion (constantes)
+_RULE = "=" * 70
+_DASH = "-" * 70
+_PROCESS_HEADER = f"{'PID':<6} {'Estado':<12} {'CPU':<8} {'Prio':<6} {'RAM':<6} {'Swap':<6}"
+
 class ProcessManager:
     """Gestor completo de procesos con CPU, memoria y sincronizacion"""
     
@@ -13,25 +22,36 @@ class ProcessManager:
         # Cargar configuracion
         config = configparser.ConfigParser()
         config.read(config_file)
+        self.config = config
         
         # Memoria
         self.ram_kb = config.getint('MEMORY', 'ram_size')
         self.swap_kb = config.getint('MEMORY', 'swap_size')
         self.page_kb = config.getint('MEMORY', 'page_size')
         self.total_frames = self.ram_kb // self.page_kb
+        Process.page_kb = self.page_kb
         
+        # Columnas paralelas por marco: pid dueno y pagina cargada
         self.ram = [None] * self.total_frames
-        self.frame_map = [None] * self.total_frames
+        self.frame_page = [None] * self.total_frames
+        self._free_frames = set(range(self.total_frames))
+        # Orden LRU de paginas residentes: (pid, pagina) -> proceso
+        self.lru = OrderedDict()
         self.swap = SwapManager(self.swap_kb, self.page_kb)
         
         # CPU con planificador FCFS
         self.cpu = CPU()
         self.scheduler = FCFSScheduler()
         
-        # Procesos
+        # Generador aleatorio unico de la simulacion; con [SIMULATION] seed
+        # la corrida es reproducible
+        self.rng = random.Random(config.getint('SIMULATION', 'seed', fallback=None))
+        
+        # Procesos (activos y bloqueados indexados por pid)
         self.all_processes = []
-        self.active_processes = []
-        self.blocked_processes = []
+        self._proc_by_pid = {}  # Procesos no terminados
+        self.active_processes = {}
+        self.blocked_processes = {}
         self.waiting_queue = []
         self.page_tables = {}
         
@@ -39,6 +59,12 @@ class ProcessManager:
         self.semaphores = {}
         self.shared_memory = {}
         
+        # Epoca de sincronizacion: cambia con cada transicion de estado que
+        # afecta a detect_deadlock, que reutiliza su resultado si no cambio
+        self._sync_epoch = 0
+        self._deadlock_epoch = -1
+        self._deadlock_result = []
+        
         # Control
         self.current_time = 0
         self.stats = Statistics()
@@ -72,45 +98,53 @@ class ProcessManager:
         process = Process(size_kb, lifetime, priority, cpu_burst)
         process.arrival_time = self.current_time
         self.all_processes.append(process)
+        self._proc_by_pid[process.pid] = process
         self.stats.total_processes += 1
         return process
     
+    def get_process(self, pid):
+        """Busca un proceso no terminado por su pid"""
+        return self._proc_by_pid.get(pid)
+    
     def allocate_process(self, process):
         """Intenta asignar un proceso a memoria"""
-        process.num_pages = (process.size_kb + self.page_kb - 1) // self.page_kb
+        # Camino rapido: todas las paginas caben en marcos libres, sin swap.
+        # Un proceso que excede RAM + swap nunca entra aqui.
+        if len(self._free_frames) >= process.num_pages:
+            self.page_tables[process.pid] = PageTable(process.pid, process.num_pages)
+            self._assign_to_ram(process)
+            process.state = ProcessState.READY
+            self._mark_ready(process)
+            self._sync_epoch += 1
+            self.active_processes[process.pid] = process
+            self.scheduler.add_process(process)
+            self.log(f"ASIGNADO: P{process.pid} ({process.size_kb}KB, {process.num_pages} pags)")
+            return True
         
         if process.size_kb > (self.ram_kb + self.swap_kb):
             self.log(f"RECHAZADO: P{process.pid} ({process.size_kb}KB) excede capacidad")
             self.stats.rejected_processes += 1
+            self._proc_by_pid.pop(process.pid, None)
             process.state = ProcessState.TERMINATED
             process.termination_cause = TerminationCause.ERROR
             return False
         
         self.page_tables[process.pid] = PageTable(process.pid, process.num_pages)
-        
-        free_frames = sum(1 for f in self.ram if f is None)
-        
-        if free_frames >= process.num_pages:
-            self._assign_to_ram(process)
-            process.state = ProcessState.READY
-            self.active_processes.append(process)
-            self.scheduler.add_process(process)
-            self.log(f"ASIGNADO: P{process.pid} ({process.size_kb}KB, {process.num_pages} pags)")
-            return True
-        else:
-            return self._allocate_with_swap(process)
+        return self._allocate_with_swap(process)
     
     def suspend_process(self, process):
         """Suspende un proceso (bloquearlo manualmente)"""
         if process.state == ProcessState.RUNNING:
             self.cpu.release()
         
+        self._account_waiting(process)
+        self._sync_epoch += 1
+        
         process.state = ProcessState.BLOCKED
         process.blocked_on = "Suspendido manualmente"
         
-        if process in self.active_processes:
-            self.active_processes.remove(process)
-        self.blocked_processes.append(process)
+        self.active_processes.pop(process.pid, None)
+        self.blocked_processes[process.pid] = process
         
         self.scheduler.remove_process(process)
         
@@ -122,10 +156,11 @@ class ProcessManager:
         if process.state == ProcessState.BLOCKED:
             process.state = ProcessState.READY
             process.blocked_on = None
+            self._mark_ready(process)
+            self._sync_epoch += 1
             
-            if process in self.blocked_processes:
-                self.blocked_processes.remove(process)
-            self.active_processes.append(process)
+            self.blocked_processes.pop(process.pid, None)
+            self.active_processes[process.pid] = process
             
             self.scheduler.add_process(process)
             
@@ -133,10 +168,36 @@ class ProcessManager:
             print(f"P{process.pid} reanudado")
     
     def force_terminate_process(self, process, cause=TerminationCause.FORCED):
-        """Termina un proceso forzadamente"""
-        if process.state == ProcessState.RUNNING:
+        """Termina un proceso forzadamente. Retorna False si ya estaba terminado"""
+        if process.state is ProcessState.TERMINATED:
+            return False
+        # Liberar la CPU si el proceso la ocupa, sea cual sea su estado
+        if self.cpu.current_process is process:
             self.cpu.release()
         
+        # Un proceso bloqueado deja de esperar: si siguiera en una cola de
+        # semaforo, un signal posterior lo reactivaria ya terminado. Puede
+        # estar encolado varias veces (y en varios semaforos) si repitio el
+        # wait estando bloqueado, asi que se quitan todas las copias
+        for sem in self.semaphores.values():
+            copies = sem.waiting_queue.count(process)
+            if copies:
+                sem.waiting_queue = deque(p for p in sem.waiting_queue if p is not process)
+                sem.value += copies
+            if process in sem.retry_queue:
+                sem.retry_queue = deque(p for p in sem.retry_queue if p is not process)
+        
+        # Devolver las unidades de mutex que retenia para despertar a sus
+        # esperas; si no, quedarian bloqueadas sin ciclo que detectar
+        for sem in self.semaphores.values():
+            held = sem.holders.pop(process.pid, 0)
+            for _ in range(held):
+                self.semaphore_release(process, sem)
+        process.blocked_on = None
+        
+        self._account_waiting(process)
+        self._sync_epoch += 1
+        
         process.state = ProcessState.TERMINATED
         process.termination_cause = cause
         process.finish_time = self.current_time
@@ -144,18 +205,19 @@ class ProcessManager:
         if process.start_time:
             process.turnaround_time = process.finish_time - process.arrival_time
             process.waiting_time = process.turnaround_time - (process.cpu_burst - process.remaining_cpu)
+        self.stats.record_finished(process)
         
         self._free_process_memory(process)
         
-        if process in self.active_processes:
-            self.active_processes.remove(process)
-        if process in self.blocked_processes:
-            self.blocked_processes.remove(process)
+        self._proc_by_pid.pop(process.pid, None)
+        self.active_processes.pop(process.pid, None)
+        self.blocked_processes.pop(process.pid, None)
         self.scheduler.remove_process(process)
         
         self.stats.forced_terminations += 1
         self.log(f"TERMINADO FORZADAMENTE: P{process.pid} - {cause.value}")
         print(f"P{process.pid} terminado: {cause.value}")
+        return True
     
     def terminate_process(self, process):
         """Termina un proceso normalmente"""
@@ -166,30 +228,46 @@ class ProcessManager:
         else:
             cause = TerminationCause.ERROR
         
-        self.force_terminate_process(process, cause)
-        self.stats.completed_processes += 1
+        if self.force_terminate_process(process, cause):
+            self.stats.completed_processes += 1
     
     # ==================== GESTION DE CPU ====================
     
+    def _mark_ready(self, process):
+        """Registra el instante en que el proceso entra a la cola de listos"""
+        # Si ya estaba listo (p. ej. despertado dos veces) se conserva el inicio
+        if process.ready_since is None:
+            process.ready_since = self.current_time
+    
+    def _account_waiting(self, process):
+        """Acumula el tiempo de espera al salir del estado listo"""
+        if process.ready_since is not None:
+            process.waiting_time += self.current_time - process.ready_since
+            process.ready_since = None
+    
     def schedule_cpu(self):
         """Ejecuta ciclo de planificacion de CPU con FCFS"""
-        # Si CPU libre, asignar nuevo proceso
-        if self.cpu.is_free() and self.scheduler.has_processes():
+        cpu = self.cpu
+        # Si CPU libre, asignar nuevo proceso. FCFS no expropia, asi que con
+        # la CPU ocupada no hay que consultar al planificador
+        if cpu.current_process is None:
             next_process = self.scheduler.get_next_process()
-            if next_process:
-                self.cpu.assign(next_process)
+            if next_process is not None:
+                self._account_waiting(next_process)
+                self._sync_epoch += 1
+                cpu.assign(next_process)
                 if next_process.start_time is None:
                     next_process.start_time = self.current_time
                 self.log(f"CPU ASIGNADA: P{next_process.pid}")
         
         # Ejecutar ciclo de CPU
-        if self.cpu.execute_cycle():
-            current = self.cpu.current_process
+        if cpu.execute_cycle():
+            current = cpu.current_process
             
             # Verificar si el proceso termino su burst
             if current.remaining_cpu <= 0:
                 self.log(f"CPU COMPLETADO: P{current.pid}")
-                self.cpu.release()
+                cpu.release()
                 self.terminate_process(current)
     
     # ==================== GESTION DE MEMORIA ====================
@@ -198,24 +276,23 @@ class ProcessManager:
         """Asigna todas las paginas de un proceso a RAM"""
         page_table = self.page_tables[process.pid]
         
-        for page_num in range(process.num_pages):
+        for page_num, entry in enumerate(page_table.entries):
             frame = self._get_free_frame()
-            if frame is not None:
-                self.ram[frame] = process.pid
-                self.frame_map[frame] = (process.pid, page_num)
-                
-                entry = page_table.get(page_num)
-                entry.frame = frame
-                entry.in_ram = True
-                entry.last_access = self.current_time
-                
-                process.pages_in_ram.add(page_num)
-                process.last_access_time[page_num] = self.current_time
+            if frame is None:
+                break
+            self.ram[frame] = process.pid
+            self.frame_page[frame] = page_num
+            
+            entry.frame = frame
+            entry.in_ram = True
+            entry.last_access = self.current_time
+            
+            process.pages_in_ram.add(page_num)
+            self.lru[(process.pid, page_num)] = process
     
     def _allocate_with_swap(self, process):
         """Asigna proceso usando swapping"""
-        free_frames = sum(1 for f in self.ram if f is None)
-        pages_needed = process.num_pages - free_frames
+        pages_needed = process.num_pages - len(self._free_frames)
         
         if self.swap.used + pages_needed > self.swap.total_frames:
             self.waiting_queue.append(process)
@@ -231,7 +308,9 @@ class ProcessManager:
         
         self._assign_to_ram(process)
         process.state = ProcessState.READY
-        self.active_processes.append(process)
+        self._mark_ready(process)
+        self._sync_epoch += 1
+        self.active_processes[process.pid] = process
         self.scheduler.add_process(process)
         
         self.log(f"ASIGNADO CON SWAP: P{process.pid}")
@@ -239,18 +318,9 @@ class ProcessManager:
     
     def _lru_select_victim(self):
         """Selecciona victima usando LRU"""
-        oldest_time = self.current_time + 1
-        victim_proc = None
-        victim_page = None
-        
-        for proc in self.active_processes:
-            for page in proc.pages_in_ram:
-                access_time = proc.last_access_time.get(page, 0)
-                if access_time < oldest_time:
-                    oldest_time = access_time
-                    victim_proc = proc
-                    victim_page = page
-        
+        if not self.lru:
+            return None, None
+        (_, victim_page), victim_proc = next(iter(self.lru.items()))
         return victim_proc, victim_page
     
     def _swap_out(self, process, page_num):
@@ -268,7 +338,10 @@ class ProcessManager:
                 entry.in_ram = False
                 
                 self.ram[frame] = None
-                self.frame_map[frame] = None
+                self.frame_page[frame] = None
+                self._free_frames.add(frame)
+                self.lru.pop((process.pid, page_num), None)
+                process.tlb_invalidate(page_num)
                 
                 process.pages_in_ram.discard(page_num)
                 process.pages_in_swap.add(page_num)
@@ -292,7 +365,7 @@ class ProcessManager:
                 swap_loc = entry.swap_loc
                 
                 self.ram[frame] = process.pid
-                self.frame_map[frame] = (process.pid, page_num)
+                self.frame_page[frame] = page_num
                 
                 entry.frame = frame
                 entry.swap_loc = None
@@ -303,30 +376,39 @@ class ProcessManager:
                 
                 process.pages_in_swap.discard(page_num)
                 process.pages_in_ram.add(page_num)
-                process.last_access_time[page_num] = self.current_time
+                self.lru[(process.pid, page_num)] = process
                 
                 return True
         return False
     
     def access_page(self, process, page_num):
         """Simula acceso a una pagina"""
-        page_table = self.page_tables.get(process.pid)
-        if not page_table:
-            return
-        
-        frame, fault = page_table.translate(page_num)
-        
-        if fault:
+        # TLB: en un acierto no se consulta la tabla de paginas. El TLB se
+        # vacia al liberar la memoria, asi que un acierto implica que existe
+        slot = page_num & TLB_MASK
+        tag, entry = process.tlb[slot]
+        if tag != page_num:
+            page_table = self.page_tables.get(process.pid)
+            if not page_table:
+                return
+            # Una sola carga indexada: la entrada residente va directo al TLB
+            entry = page_table.get(page_num)
+            if entry is not None and entry.in_ram:
+                process.tlb[slot] = (page_num, entry)
+            else:
+                entry = None
+        
+        if entry is None:
             process.page_faults += 1
             self.stats.total_page_faults += 1
             
             if page_num in process.pages_in_swap:
                 self._swap_in(process, page_num)
+        else:
+            entry.last_access = self.current_time
+            self.lru.move_to_end((process.pid, page_num))
         
         self.stats.memory_accesses += 1
-        
-        if page_num in process.last_access_time:
-            process.last_access_time[page_num] = self.current_time
     
     def _free_process_memory(self, process):
         """Libera memoria de un proceso"""
@@ -335,7 +417,12 @@ class ProcessManager:
             if entry and entry.in_ram:
                 frame = entry.frame
                 self.ram[frame] = None
-                self.frame_map[frame] = None
+                self.frame_page[frame] = None
+                self._free_frames.add(frame)
+                self.lru.pop((process.pid, page), None)
+        process.pages_in_ram.clear()
+        process.pages_in_swap.clear()
+        process.tlb_flush()
         
         self.swap.free_process(process.pid)
         
@@ -343,54 +430,100 @@ class ProcessManager:
             del self.page_tables[process.pid]
     
     def _get_free_frame(self):
-        """Busca frame libre en RAM"""
-        for i in range(self.total_frames):
-            if self.ram[i] is None:
-                return i
+        """Toma un frame libre de RAM (None si no hay)"""
+        if self._free_frames:
+            return self._free_frames.pop()
         return None
     
     # ==================== SINCRONIZACION ====================
     
-    def create_semaphore(self, name, initial_value=1):
-        """Crea un semaforo"""
-        self.semaphores[name] = Semaphore(name, initial_value)
+    def create_semaphore(self, name, initial_value=1, mutex=False):
+        """Crea un semaforo; mutex=True si lo libera el mismo proceso que lo adquirio"""
+        self.semaphores[name] = Semaphore(name, initial_value, mutex)
         self.log(f"SEMAFORO CREADO: {name} (valor={initial_value})")
         return self.semaphores[name]
     
     def semaphore_wait(self, process, sem_name):
         """Operacion Wait en semaforo"""
-        if sem_name not in self.semaphores:
+        sem = self.semaphores.get(sem_name)
+        if sem is None:
             return False
+        return self.semaphore_acquire(process, sem)
+    
+    def semaphore_acquire(self, process, sem):
+        """Wait sobre un semaforo ya resuelto (evita buscarlo por nombre en cada operacion)"""
+        self._sync_epoch += 1
+        if sem.wait(process):
+            return True
+        return self._block_process(process, sem)
+    
+    def _block_process(self, process, sem):
+        """Registra un proceso que quedo bloqueado en sem; siempre retorna False"""
+        self._account_waiting(process)
+        self.active_processes.pop(process.pid, None)
+        self.blocked_processes[process.pid] = process
         
-        sem = self.semaphores[sem_name]
-        if not sem.wait(process):
-            if process in self.active_processes:
-                self.active_processes.remove(process)
-            self.blocked_processes.append(process)
-            
-            if process.state == ProcessState.RUNNING:
-                self.cpu.release()
-            
-            self.stats.total_blocks += 1
-            self.log(f"BLOQUEADO: P{process.pid} en {sem_name}")
-            return False
+        # El semaforo ya lo marco bloqueado: se libera la CPU si la ocupaba y sale
+        # de la cola de listos hasta que un signal lo despierte
+        if self.cpu.current_process is process:
+            self.cpu.release()
+        self.scheduler.remove_process(process)
         
-        return True
+        self.stats.total_blocks += 1
+        self.log(f"BLOQUEADO: P{process.pid} en {sem.name}")
+        return False
     
     def semaphore_signal(self, process, sem_name):
         """Operacion Signal en semaforo"""
-        if sem_name not in self.semaphores:
-            return
-        
-        sem = self.semaphores[sem_name]
+        sem = self.semaphores.get(sem_name)
+        if sem is not None:
+            self.semaphore_release(process, sem)
+    
+    def semaphore_release(self, process, sem):
+        """Signal sobre un semaforo ya resuelto"""
         unblocked = sem.signal(process)
+        self._sync_epoch += 1
         
         if unblocked:
-            if unblocked in self.blocked_processes:
-                self.blocked_processes.remove(unblocked)
-            self.active_processes.append(unblocked)
+            self._mark_ready(unblocked)
+            self.blocked_processes.pop(unblocked.pid, None)
+            self.active_processes[unblocked.pid] = unblocked
             self.scheduler.add_process(unblocked)
-            self.log(f"DESBLOQUEADO: P{unblocked.pid} de {sem_name}")
+            self.log(f"DESBLOQUEADO: P{unblocked.pid} de {sem.name}")
+    
+    def semaphore_wait_all(self, process, sem_names):
+        """Wait sobre varios semaforos a la vez: adquiere todos o ninguno"""
+        sems = [self.semaphores.get(name) for name in sem_names]
+        if None in sems:
+            return False
+        return self.semaphore_acquire_all(process, sems)
+    
+    def semaphore_acquire_all(self, process, sems):
+        """Adquiere todos los semaforos ya resueltos o ninguno"""
+        if process.state is ProcessState.BLOCKED:
+            return False
+        for sem in sems:
+            if sem.value <= 0:
+                # No se toma ninguno: el proceso espera en el primero no
+                # disponible sin reservarlo y al despertar reintenta todo
+                self._sync_epoch += 1
+                sem.block_until_available(process)
+                return self._block_process(process, sem)
+        
+        for sem in sems:
+            sem.wait(process)
+        self._sync_epoch += 1
+        return True
+    
+    def semaphore_signal_all(self, process, sem_names):
+        """Signal sobre varios semaforos, en el orden dado"""
+        for name in sem_names:
+            self.semaphore_signal(process, name)
+    
+    def semaphore_release_all(self, process, sems):
+        """Signal sobre varios semaforos ya resueltos, en el orden dado"""
+        for sem in sems:
+            self.semaphore_release(process, sem)
     
     def create_shared_memory(self, name, size=10):
         """Crea area de memoria compartida"""
@@ -398,89 +531,184 @@ class ProcessManager:
         self.log(f"MEMORIA COMPARTIDA: {name} creada (tamano={size})")
         return self.shared_memory[name]
     
+    def _wait_for_graph(self):
+        """Grafo de espera: pid bloqueado -> pids bloqueados que retienen su mutex"""
+        # Un proceso ya terminado no es nodo ni destino de aristas
+        blocked = {pid: proc for pid, proc in self.blocked_processes.items()
+                   if proc.state is not ProcessState.TERMINATED}
+        graph = {}
+        for pid, proc in blocked.items():
+            sem = self.semaphores.get(proc.blocked_on)
+            if sem is None or not sem.mutex:
+                graph[pid] = []
+            else:
+                graph[pid] = [h for h in sem.holders if h in blocked]
+        return graph
+    
+    @staticmethod
+    def _deadlocked_pids(graph):
+        """Tarjan iterativo: pids en componentes con ciclo (tamano >= 2 o lazo)"""
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        deadlocked = []
+        counter = 0
+        
+        for root in graph:
+            if root in index:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(graph[root]))]
+            
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(graph[child])))
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in graph[node]:
+                            deadlocked.extend(component)
+        
+        return deadlocked
+    
+    def deadlock_pending(self):
+        """Indica si el grafo de espera cambio desde la ultima deteccion"""
+        # Basta un bloqueado: un proceso puede esperar un mutex que el mismo retiene
+        return self._sync_epoch != self._deadlock_epoch and len(self.blocked_processes) > 0
+    
     def detect_deadlock(self):
-        """Detecta interbloqueos simples"""
+        """Detecta interbloqueos buscando ciclos en el grafo de espera"""
+        if self._sync_epoch == self._deadlock_epoch:
+            return list(self._deadlock_result)
+        self._deadlock_epoch = self._sync_epoch
+        self._deadlock_result = []
+        
         if not self.blocked_processes:
             return []
         
-        if len(self.blocked_processes) >= len(self.active_processes) and len(self.active_processes) > 0:
-            if not self.scheduler.has_processes() and self.cpu.is_free():
-                self.stats.deadlocks_detected += 1
-                self.log("DEADLOCK DETECTADO")
-                return self.blocked_processes
+        deadlocked = self._deadlocked_pids(self._wait_for_graph())
+        if deadlocked:
+            self.stats.deadlocks_detected += 1
+            self.log("DEADLOCK DETECTADO")
+            self._deadlock_result = [self.blocked_processes[pid] for pid in deadlocked]
         
-        return []
+        return list(self._deadlock_result)
     
     # ==================== UTILIDADES ====================
     
+    def get_ram_used(self):
+        """Marcos de RAM ocupados"""
+        return self.total_frames - len(self._free_frames)
+    
     def get_ram_utilization(self):
-        used = sum(1 for f in self.ram if f is not None)
+        used = self.get_ram_used()
         return (used / self.total_frames * 100) if self.total_frames > 0 else 0
     
+    def age_processes(self):
+        """Descuenta un ciclo de vida a los activos; retorna los que la agotaron"""
+        expired = []
+        for proc in self.active_processes.values():
+            proc.remaining_lifetime -= 1
+            if proc.remaining_lifetime <= 0:
+                expired.append(proc)
+        return expired
+    
     def increment_time(self):
         """Incrementa reloj del sistema"""
         self.current_time += 1
-        
-        for proc in self.active_processes:
-            if proc.state == ProcessState.READY:
-                proc.waiting_time += 1
     
     # ==================== VISUALIZACION ====================
     
+    def status_lines(self):
+        """Lineas del estado general del sistema"""
+        current = self.cpu.current_process
+        return [
+            f"\n{_RULE}",
+            f"ESTADO DEL SISTEMA - Ciclo {self.current_time}",
+            _RULE,
+            f"\n[CPU]  Utilizacion: {self.cpu.get_utilization():.1f}% | "
+            f"Proceso: {f'P{current.pid}' if current else 'IDLE'}",
+            f"[RAM]  {self.get_ram_utilization():.1f}% | "
+            f"Swap: {self.swap.get_utilization():.1f}%",
+            f"[PROC] Activos:{len(self.active_processes)} | "
+            f"Bloqueados:{len(self.blocked_processes)} | "
+            f"Cola:{len(self.scheduler)}",
+            f"[STATS] PF:{self.stats.total_page_faults} | "
+            f"Tasa: {self.stats.page_fault_rate():.1f}% | "
+            f"Swaps:{self.stats.total_swaps}",
+        ]
+    
     def display_status(self):
         """Muestra estado general del sistema"""
-        print(f"\n{'='*70}")
-        print(f"ESTADO DEL SISTEMA - Ciclo {self.current_time}")
-        print(f"{'='*70}")
-        print(f"\n[CPU]  Utilizacion: {self.cpu.get_utilization():.1f}% | "
-              f"Proceso: {f'P{self.cpu.current_process.pid}' if self.cpu.current_process else 'IDLE'}")
-        print(f"[RAM]  {self.get_ram_utilization():.1f}% | "
-              f"Swap: {self.swap.get_utilization():.1f}%")
-        print(f"[PROC] Activos:{len(self.active_processes)} | "
-              f"Bloqueados:{len(self.blocked_processes)} | "
-              f"Cola:{len(self.scheduler.ready_queue)}")
-        print(f"[STATS] PF:{self.stats.total_page_faults} | "
-              f"Tasa: {self.stats.page_fault_rate():.1f}% | "
-              f"Swaps:{self.stats.total_swaps}")
+        sys.stdout.write("\n".join(self.status_lines()) + "\n")
     
     def display_processes(self):
         """Muestra lista de procesos"""
-        print(f"\n{'='*70}")
-        print("PROCESOS ACTIVOS")
-        print(f"{'='*70}")
-        print(f"{'PID':<6} {'Estado':<12} {'CPU':<8} {'Prio':<6} {'RAM':<6} {'Swap':<6}")
-        print("-"*70)
-        
-        for proc in self.active_processes[:15]:
-            print(f"P{proc.pid:<5} {proc.state.value:<12} "
-                  f"{proc.remaining_cpu:<8} {proc.priority:<6} "
-                  f"{len(proc.pages_in_ram):<6} {len(proc.pages_in_swap):<6}")
+        lines = [
+            f"\n{_RULE}",
+            "PROCESOS ACTIVOS",
+            _RULE,
+            _PROCESS_HEADER,
+            _DASH,
+        ]
+        for proc in islice(self.active_processes.values(), 15):
+            lines.append(f"P{proc.pid:<5} {proc.state.value:<12} "
+                         f"{proc.remaining_cpu:<8} {proc.priority:<6} "
+                         f"{len(proc.pages_in_ram):<6} {len(proc.pages_in_swap):<6}")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def display_stats(self):
         """Muestra estadisticas finales"""
-        self.stats.calculate_cpu_metrics(self.all_processes)
-        
-        print(f"\n{'='*70}")
-        print("ESTADISTICAS FINALES")
-        print(f"{'='*70}")
-        print(f"\n[Procesos]")
-        print(f"  Total creados:     {self.stats.total_processes}")
-        print(f"  Completados:       {self.stats.completed_processes}")
-        print(f"  Rechazados:        {self.stats.rejected_processes}")
-        print(f"  Term. forzadas:    {self.stats.forced_terminations}")
-        
-        print(f"\n[CPU] Planificador: FCFS")
-        print(f"  Utilizacion:       {self.cpu.get_utilization():.2f}%")
-        print(f"  Context switches:  {self.cpu.context_switches}")
-        print(f"  Avg. Waiting:      {self.stats.avg_waiting_time:.2f} ciclos")
-        print(f"  Avg. Turnaround:   {self.stats.avg_turnaround_time:.2f} ciclos")
-        
-        print(f"\n[Memoria]")
-        print(f"  Page Faults:       {self.stats.total_page_faults}")
-        print(f"  Tasa de fallos:    {self.stats.page_fault_rate():.2f}%")
-        print(f"  Total Swaps:       {self.stats.total_swaps}")
-        
-        print(f"\n[Sincronizacion]")
-        print(f"  Bloqueos totales:  {self.stats.total_blocks}")
-        print(f"  Deadlocks:         {self.stats.deadlocks_detected}")
-        print(f"{'='*70}\n")
+        self.stats.calculate_cpu_metrics()
+        stats = self.stats
+        
+        lines = [
+            f"\n{_RULE}",
+            "ESTADISTICAS FINALES",
+            _RULE,
+            "\n[Procesos]",
+            f"  Total creados:     {stats.total_processes}",
+            f"  Completados:       {stats.completed_processes}",
+            f"  Rechazados:        {stats.rejected_processes}",
+            f"  Term. forzadas:    {stats.forced_terminations}",
+            
+            "\n[CPU] Planificador: FCFS",
+            f"  Utilizacion:       {self.cpu.get_utilization():.2f}%",
+            f"  Context switches:  {self.cpu.context_switches}",
+            f"  Avg. Waiting:      {stats.avg_waiting_time:.2f} ciclos",
+            f"  Avg. Turnaround:   {stats.avg_turnaround_time:.2f} ciclos",
+            
+            "\n[Memoria]",
+            f"  Page Faults:       {stats.total_page_faults}",
+            f"  Tasa de fallos:    {stats.page_fault_rate():.2f}%",
+            f"  Total Swaps:       {stats.total_swaps}",
+            
+            "\n[Sincronizacion]",
+            f"  Bloqueos totales:  {stats.total_blocks}",
+            f"  Deadlocks:         {stats.deadlocks_detected}",
+            f"{_RULE}\n",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
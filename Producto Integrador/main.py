@@ -2,33 +2,72 @@
 
 import sys
 import time
-import random
 import os
-import configparser
+from itertools import islice
+from types import SimpleNamespace
 from gestor_memoria import ProcessManager
-from clases import TerminationCause
+from clases import ProcessState, TerminationCause
+
+# Con SIM_HEADLESS=1 los ciclos corren sin pausas (benchmarks, perfilado)
+HEADLESS = os.environ.get('SIM_HEADLESS') == '1'
+DEMO_PERIOD = 0.5
+AUTO_PERIOD = 0.8
+
+def pause(seconds):
+    """Pausa de presentacion; se omite en modo headless"""
+    if not HEADLESS:
+        time.sleep(seconds)
+
+def pace(next_tick, period):
+    """Espera hasta next_tick (reloj monotonico) y retorna el siguiente tick.
+    El trabajo del ciclo se descuenta de la espera, sin acumular deriva"""
+    if HEADLESS:
+        return next_tick
+    now = time.monotonic()
+    if next_tick > now:
+        time.sleep(next_tick - now)
+        now = next_tick
+    return now + period
 
 def clear_screen():
     """Limpia la pantalla"""
     os.system('clear' if os.name == 'posix' else 'cls')
 
-def generate_process(config, pm):
-    """Genera un proceso aleatorio"""
-    size = random.randint(
-        config.getint('SIMULATION', 'process_size_min'),
-        config.getint('SIMULATION', 'process_size_max')
-    )
-    lifetime = random.randint(
-        config.getint('SIMULATION', 'process_lifetime_min'),
-        config.getint('SIMULATION', 'process_lifetime_max')
+def repaint(lines):
+    """Redibuja la pantalla en una sola escritura: cursor al inicio, cada
+    linea borra su resto y al final se borra lo que quede debajo"""
+    # Separar los saltos embebidos para que cada fila de pantalla se limpie
+    rows = "\n".join(lines).split("\n")
+    sys.stdout.write("\x1b[H" + "\x1b[K\n".join(rows) + "\x1b[K\n\x1b[J")
+    sys.stdout.flush()
+
+def load_sim_config(config):
+    """Lee una sola vez la seccion [SIMULATION] como enteros"""
+    section = config['SIMULATION']
+    return SimpleNamespace(
+        max_processes=section.getint('max_processes'),
+        arrival_min=section.getint('process_arrival_min'),
+        arrival_max=section.getint('process_arrival_max'),
+        lifetime_min=section.getint('process_lifetime_min'),
+        lifetime_max=section.getint('process_lifetime_max'),
+        size_min=section.getint('process_size_min'),
+        size_max=section.getint('process_size_max'),
+        refresh_every=max(1, section.getint('refresh_every', fallback=1)),
     )
-    priority = random.randint(1, 10)
-    cpu_burst = random.randint(3, lifetime)
+
+def generate_process(sim_cfg, pm):
+    """Genera un proceso aleatorio"""
+    rng = pm.rng
+    size = rng.randint(sim_cfg.size_min, sim_cfg.size_max)
+    lifetime = rng.randint(sim_cfg.lifetime_min, sim_cfg.lifetime_max)
+    priority = rng.randint(1, 10)
+    cpu_burst = rng.randint(3, lifetime)
     
     return pm.create_process(size, lifetime, priority, cpu_burst)
 
 def demo_producer_consumer(pm):
     """Demostracion del problema Productor-Consumidor"""
+    rng = pm.rng
     clear_screen()
     print(f"\n{'='*70}")
     print("PROBLEMA PRODUCTOR-CONSUMIDOR")
@@ -43,9 +82,9 @@ def demo_producer_consumer(pm):
     # Crear recursos de sincronizacion
     buffer_size = 5
     pm.create_shared_memory('buffer', buffer_size)
-    pm.create_semaphore('mutex', 1)
-    pm.create_semaphore('empty', buffer_size)
-    pm.create_semaphore('full', 0)
+    mutex = pm.create_semaphore('mutex', 1, mutex=True)
+    empty = pm.create_semaphore('empty', buffer_size)
+    full = pm.create_semaphore('full', 0)
     
     print(f"\nBuffer creado (tamano={buffer_size})")
     print("Semaforos creados: mutex, empty, full\n")
@@ -63,52 +102,58 @@ def demo_producer_consumer(pm):
     print(f"{producer.role} P{producer.pid} creado")
     print(f"{consumer.role} P{consumer.pid} creado\n")
     
-    time.sleep(2)
+    pause(2)
     
     # Simular interaccion
     buffer = pm.shared_memory['buffer']
     items_produced = 0
     items_consumed = 0
     
-    for cycle in range(20):
-        pm.increment_time()
-        
-        # Productor intenta producir
-        if producer.is_active() and random.random() > 0.3:
-            if pm.semaphore_wait(producer, 'empty'):
-                if pm.semaphore_wait(producer, 'mutex'):
+    # Conjuntos de semaforos que cada rol adquiere y libera juntos
+    produce_acquire = (empty, mutex)
+    produce_release = (mutex, full)
+    consume_acquire = (full, mutex)
+    consume_release = (mutex, empty)
+    
+    next_tick = time.monotonic() + DEMO_PERIOD
+    try:
+        for cycle in range(20):
+            pm.increment_time()
+            
+            # Productor intenta producir
+            if producer.is_active() and rng.random() > 0.3:
+                if pm.semaphore_acquire_all(producer, produce_acquire):
                     # Seccion critica: producir
                     item = f"Item-{items_produced}"
                     if buffer.write(producer, item):
                         items_produced += 1
                         print(f"[Ciclo {pm.current_time:2d}] P{producer.pid} PRODUJO: {item}")
                     
-                    pm.semaphore_signal(producer, 'mutex')
-                    pm.semaphore_signal(producer, 'full')
-        
-        # Consumidor intenta consumir
-        if consumer.is_active() and random.random() > 0.4:
-            if pm.semaphore_wait(consumer, 'full'):
-                if pm.semaphore_wait(consumer, 'mutex'):
+                    pm.semaphore_release_all(producer, produce_release)
+            
+            # Consumidor intenta consumir
+            if consumer.is_active() and rng.random() > 0.4:
+                if pm.semaphore_acquire_all(consumer, consume_acquire):
                     # Seccion critica: consumir
                     item = buffer.read(consumer)
                     if item:
                         items_consumed += 1
                         print(f"[Ciclo {pm.current_time:2d}] P{consumer.pid} CONSUMIO: {item[1]}")
                     
-                    pm.semaphore_signal(consumer, 'mutex')
-                    pm.semaphore_signal(consumer, 'empty')
-        
-        # Ejecutar CPU
-        pm.schedule_cpu()
-        
-        # Accesos a memoria aleatorios
-        for proc in [producer, consumer]:
-            if proc.is_active() and proc.num_pages > 0:
-                page = random.randint(0, proc.num_pages - 1)
-                pm.access_page(proc, page)
-        
-        time.sleep(0.5)
+                    pm.semaphore_release_all(consumer, consume_release)
+            
+            # Ejecutar CPU
+            pm.schedule_cpu()
+            
+            # Accesos a memoria aleatorios
+            for proc in [producer, consumer]:
+                if proc.is_active() and proc.num_pages > 0:
+                    page = rng.randint(0, proc.num_pages - 1)
+                    pm.access_page(proc, page)
+            
+            next_tick = pace(next_tick, DEMO_PERIOD)
+    except KeyboardInterrupt:
+        print("\nDemo detenido")
     
     print(f"\n{'='*70}")
     print("RESULTADOS DEL DEMO")
@@ -117,7 +162,7 @@ def demo_producer_consumer(pm):
     print(f"Items consumidos:  {items_consumed}")
     print(f"En buffer:         {len(buffer.buffer)}")
     print(f"\nHistorial del semaforo 'mutex':")
-    for event in pm.semaphores['mutex'].history[-10:]:
+    for event in mutex.formatted_history(last=10):
         print(f"  - {event}")
     
     # Terminar procesos
@@ -128,19 +173,23 @@ def demo_producer_consumer(pm):
 
 def run_automatic_mode(pm, config):
     """Modo automatico con generacion continua"""
+    sim_cfg = load_sim_config(config)
+    rng = pm.rng
     print("\nModo Automatico")
     print("Presione Ctrl+C para detener\n")
-    time.sleep(2)
+    pause(2)
     
-    max_procs = config.getint('SIMULATION', 'max_processes')
-    next_arrival = random.randint(
-        config.getint('SIMULATION', 'process_arrival_min'),
-        config.getint('SIMULATION', 'process_arrival_max')
-    )
+    max_procs = sim_cfg.max_processes
+    arrival_min = sim_cfg.arrival_min
+    arrival_max = sim_cfg.arrival_max
+    refresh_every = sim_cfg.refresh_every
+    next_arrival = rng.randint(arrival_min, arrival_max)
     
     cycle = 0
     generated = 0
+    next_tick = time.monotonic() + AUTO_PERIOD
     
+    clear_screen()
     try:
         while generated < max_procs or pm.active_processes:
             cycle += 1
@@ -148,52 +197,48 @@ def run_automatic_mode(pm, config):
             
             # Generar nuevo proceso
             if cycle >= next_arrival and generated < max_procs:
-                proc = generate_process(config, pm)
+                proc = generate_process(sim_cfg, pm)
                 generated += 1
                 pm.allocate_process(proc)
                 pm.log(f"LLEGADA: P{proc.pid} ({proc.size_kb}KB, CPU:{proc.cpu_burst}, Prio:{proc.priority})")
                 
-                next_arrival = cycle + random.randint(
-                    config.getint('SIMULATION', 'process_arrival_min'),
-                    config.getint('SIMULATION', 'process_arrival_max')
-                )
+                next_arrival = cycle + rng.randint(arrival_min, arrival_max)
             
             # Planificacion de CPU (FCFS)
             pm.schedule_cpu()
             
-            # Simular accesos a memoria
-            for proc in list(pm.active_processes):
-                if proc.num_pages > 0 and proc.state.value in ["En Ejecucion", "Listo"]:
-                    for _ in range(random.randint(1, min(3, proc.num_pages))):
-                        page = random.randint(0, proc.num_pages - 1)
+            # Simular accesos a memoria (los accesos no alteran los activos)
+            for proc in pm.active_processes.values():
+                if proc.num_pages > 0 and (proc.state is ProcessState.RUNNING or proc.state is ProcessState.READY):
+                    count = rng.randint(1, min(3, proc.num_pages))
+                    for page in rng.choices(range(proc.num_pages), k=count):
                         pm.access_page(proc, page)
-                
-                # Decrementar vida
-                proc.remaining_lifetime -= 1
-                if proc.remaining_lifetime <= 0 and proc.state.value != "Terminado":
-                    pm.terminate_process(proc)
             
-            # Detectar deadlock
-            deadlocked = pm.detect_deadlock()
-            if deadlocked:
-                print(f"\nDEADLOCK DETECTADO con {len(deadlocked)} procesos")
-                for proc in deadlocked:
-                    pm.force_terminate_process(proc, TerminationCause.DEADLOCK)
+            # Decrementar vida
+            for proc in pm.age_processes():
+                pm.terminate_process(proc)
             
-            # Mostrar estado
-            if cycle % 1 == 0:
-                clear_screen()
-                pm.display_status()
-                
+            # Detectar deadlock (solo si hubo cambios de sincronizacion)
+            if pm.deadlock_pending():
+                deadlocked = pm.detect_deadlock()
+                if deadlocked:
+                    print(f"\nDEADLOCK DETECTADO con {len(deadlocked)} procesos")
+                    for proc in deadlocked:
+                        pm.force_terminate_process(proc, TerminationCause.DEADLOCK)
+            
+            # Mostrar estado cada refresh_every ciclos
+            if cycle % refresh_every == 0:
+                lines = pm.status_lines()
                 if pm.active_processes:
-                    print(f"\nPROCESOS ACTIVOS (Top 10):")
-                    print(f"{'PID':<6} {'Estado':<12} {'CPU':<8} {'Vida':<6} {'Prio':<6}")
-                    print("-"*50)
-                    for p in pm.active_processes[:10]:
-                        print(f"P{p.pid:<5} {p.state.value:<12} "
-                              f"{p.remaining_cpu:<8} {p.remaining_lifetime:<6} {p.priority:<6}")
+                    lines.append(f"\nPROCESOS ACTIVOS (Top 10):")
+                    lines.append(f"{'PID':<6} {'Estado':<12} {'CPU':<8} {'Vida':<6} {'Prio':<6}")
+                    lines.append("-"*50)
+                    for p in islice(pm.active_processes.values(), 10):
+                        lines.append(f"P{p.pid:<5} {p.state.value:<12} "
+                                     f"{p.remaining_cpu:<8} {p.remaining_lifetime:<6} {p.priority:<6}")
+                repaint(lines)
             
-            time.sleep(0.8)
+            next_tick = pace(next_tick, AUTO_PERIOD)
             
             if generated >= max_procs and not pm.active_processes and not pm.waiting_queue:
                 print("\nSimulacion completada")
@@ -204,6 +249,8 @@ def run_automatic_mode(pm, config):
 
 def run_interactive_mode(pm, config):
     """Modo interactivo con comandos completos"""
+    sim_cfg = load_sim_config(config)
+    rng = pm.rng
     print("\nModo Interactivo")
     print("\nComandos disponibles:")
     print("  n - Generar nuevo proceso")
@@ -222,16 +269,17 @@ def run_interactive_mode(pm, config):
     print("  q - Salir")
     
     generated = 0
-    max_procs = config.getint('SIMULATION', 'max_processes')
+    max_procs = sim_cfg.max_processes
     
     while True:
         cmd = input("\n> ").strip().lower()
-        parts = cmd.split()
-        cmd_base = parts[0] if parts else ""
+        # Solo suspend/resume/kill/t usan el argumento que sigue al comando
+        cmd_base, _, arg = cmd.partition(' ')
+        arg = arg.lstrip().partition(' ')[0]
         
         if cmd_base == 'n':
             if generated < max_procs:
-                proc = generate_process(config, pm)
+                proc = generate_process(sim_cfg, pm)
                 generated += 1
                 if pm.allocate_process(proc):
                     print(f"P{proc.pid} asignado ({proc.size_kb}KB, CPU:{proc.cpu_burst}, Prio:{proc.priority})")
@@ -244,14 +292,14 @@ def run_interactive_mode(pm, config):
             pm.increment_time()
             pm.schedule_cpu()
             
-            for proc in list(pm.active_processes):
+            for proc in pm.active_processes.values():
                 if proc.num_pages > 0:
-                    for _ in range(random.randint(1, min(2, proc.num_pages))):
-                        pm.access_page(proc, random.randint(0, proc.num_pages - 1))
-                
-                proc.remaining_lifetime -= 1
-                if proc.remaining_lifetime <= 0:
-                    pm.terminate_process(proc)
+                    count = rng.randint(1, min(2, proc.num_pages))
+                    for page in rng.choices(range(proc.num_pages), k=count):
+                        pm.access_page(proc, page)
+            
+            for proc in pm.age_processes():
+                pm.terminate_process(proc)
             
             print(f"Ciclo {pm.current_time} ejecutado")
         
@@ -280,56 +328,56 @@ def run_interactive_mode(pm, config):
             pm.display_processes()
         
         elif cmd_base == 't':
-            if len(parts) > 1:
+            if arg:
                 try:
-                    display_page_table(pm, int(parts[1]))
-                except:
+                    display_page_table(pm, int(arg))
+                except ValueError:
                     print("PID invalido")
             else:
                 pid = input("  PID: P")
                 try:
                     display_page_table(pm, int(pid))
-                except:
+                except ValueError:
                     print("PID invalido")
         
         elif cmd_base == 'suspend':
-            if len(parts) > 1:
+            if arg:
                 try:
-                    pid = int(parts[1])
-                    proc = next((p for p in pm.active_processes if p.pid == pid), None)
+                    pid = int(arg)
+                    proc = pm.active_processes.get(pid)
                     if proc:
                         pm.suspend_process(proc)
                     else:
                         print(f"Proceso P{pid} no encontrado")
-                except:
+                except ValueError:
                     print("Comando invalido: suspend <pid>")
             else:
                 print("Uso: suspend <pid>")
         
         elif cmd_base == 'resume':
-            if len(parts) > 1:
+            if arg:
                 try:
-                    pid = int(parts[1])
-                    proc = next((p for p in pm.blocked_processes if p.pid == pid), None)
+                    pid = int(arg)
+                    proc = pm.blocked_processes.get(pid)
                     if proc:
                         pm.resume_process(proc)
                     else:
                         print(f"Proceso P{pid} no encontrado o no esta bloqueado")
-                except:
+                except ValueError:
                     print("Comando invalido: resume <pid>")
             else:
                 print("Uso: resume <pid>")
         
         elif cmd_base == 'kill':
-            if len(parts) > 1:
+            if arg:
                 try:
-                    pid = int(parts[1])
-                    proc = next((p for p in pm.all_processes if p.pid == pid), None)
-                    if proc and proc.state.value != "Terminado":
+                    pid = int(arg)
+                    proc = pm.get_process(pid)
+                    if proc and proc.state is not ProcessState.TERMINATED:
                         pm.force_terminate_process(proc, TerminationCause.FORCED)
                     else:
                         print(f"Proceso P{pid} no encontrado o ya terminado")
-                except:
+                except ValueError:
                     print("Comando invalido: kill <pid>")
             else:
                 print("Uso: kill <pid>")
@@ -364,13 +412,12 @@ def display_memory_map(pm):
     print(f"\n{'='*70}")
     print(f"MAPA DE MEMORIA RAM")
     print(f"{'='*70}")
-    used = sum(1 for f in pm.ram if f is not None)
+    used = pm.get_ram_used()
     print(f"Frames: {used}/{pm.total_frames} | Utilizacion: {pm.get_ram_utilization():.1f}%")
     print(f"{'-'*70}")
     for i in range(min(20, pm.total_frames)):
         if pm.ram[i]:
-            _, page = pm.frame_map[i]
-            print(f"Marco {i:2d}: P{pm.ram[i]} - Pagina {page}")
+            print(f"Marco {i:2d}: P{pm.ram[i]} - Pagina {pm.frame_page[i]}")
         else:
             print(f"Marco {i:2d}: [Libre]")
     if pm.total_frames > 20:
@@ -386,10 +433,9 @@ def display_swap_map(pm):
           f"Utilizacion: {pm.swap.get_utilization():.1f}%")
     print(f"{'-'*70}")
     count = 0
-    for i, data in enumerate(pm.swap.frames):
-        if data:
-            pid, page = data
-            print(f"Frame {i:2d}: P{pid} - Pagina {page}")
+    for i, pid in enumerate(pm.swap.pids):
+        if pid is not None:
+            print(f"Frame {i:2d}: P{pid} - Pagina {pm.swap.pages[i]}")
             count += 1
             if count >= 20:
                 remaining = pm.swap.used - count
@@ -405,20 +451,23 @@ def display_page_table(pm, pid):
         return
     
     pt = pm.page_tables[pid]
-    print(f"\n{'='*60}")
-    print(f"TABLA DE PAGINAS - Proceso P{pid}")
-    print(f"{'='*60}")
-    print(f"{'Pag':<10} {'Marco':<10} {'Estado':<15}")
-    print(f"{'-'*60}")
-    for page_num in sorted(pt.entries.keys()):
-        entry = pt.entries[page_num]
+    # Las entradas ya estan en orden de pagina: se recorren sin ordenar
+    lines = [
+        f"\n{'='*60}",
+        f"TABLA DE PAGINAS - Proceso P{pid}",
+        f"{'='*60}",
+        f"{'Pag':<10} {'Marco':<10} {'Estado':<15}",
+        f"{'-'*60}",
+    ]
+    for page_num, entry in enumerate(pt.entries):
         if entry.in_ram:
-            print(f"{page_num:<10} {entry.frame:<10} {'RAM':<15}")
+            lines.append(f"{page_num:<10} {entry.frame:<10} {'RAM':<15}")
         elif entry.swap_loc is not None:
-            print(f"{page_num:<10} {'-':<10} {'SWAP':<15}")
+            lines.append(f"{page_num:<10} {'-':<10} {'SWAP':<15}")
         else:
-            print(f"{page_num:<10} {'-':<10} {'No cargada':<15}")
-    print(f"{'='*60}\n")
+            lines.append(f"{page_num:<10} {'-':<10} {'No cargada':<15}")
+    lines.append(f"{'='*60}\n")
+    print("\n".join(lines))
 
 def main():
     """Funcion principal"""
@@ -429,8 +478,7 @@ def main():
     
     # Inicializar
     pm = ProcessManager('config.ini')
-    config = configparser.ConfigParser()
-    config.read('config.ini')
+    config = pm.config
     
     print("\nSimulador inicializado")
     print("Planificador: FCFS (First Come, First Served)")
@@ -1,6 +1,7 @@
 """Implementacion de planificador FCFS - First Come, First Served"""
 
 from collections import deque
+from itertools import count
 from clases import ProcessState
 
 class FCFSScheduler:
@@ -8,23 +9,35 @@ class FCFSScheduler:
     
     def __init__(self):
         self.name = "FCFS"
+        # Entradas (turno, proceso) en orden de llegada. Retirar un proceso
+        # solo lo borra de _queued; su entrada queda como lapida en la cola
         self.ready_queue = deque()
+        self._queued = {}  # pid -> turno vigente
+        self._turns = count()
+    
+    def __len__(self):
+        return len(self._queued)
     
     def add_process(self, process):
         """Agrega proceso a la cola de listos"""
-        if process.state == ProcessState.READY or process.state == ProcessState.NEW:
+        if process.state is ProcessState.READY or process.state is ProcessState.NEW:
             process.state = ProcessState.READY
-            self.ready_queue.append(process)
+            turn = next(self._turns)
+            self._queued[process.pid] = turn
+            self.ready_queue.append((turn, process))
     
     def get_next_process(self):
         """Retorna el primer proceso en llegar (FIFO)"""
-        if self.ready_queue:
-            return self.ready_queue.popleft()
+        while self.ready_queue:
+            turn, process = self.ready_queue.popleft()
+            if self._queued.get(process.pid) == turn:
+                del self._queued[process.pid]
+                return process
         return None
     
     def has_processes(self):
         """Verifica si hay procesos en la cola"""
-        return len(self.ready_queue) > 0
+        return len(self._queued) > 0
     
     def should_preempt(self, current_process):
         """FCFS"""
@@ -32,5 +45,10 @@ class FCFSScheduler:
     
     def remove_process(self, process):
         """Elimina un proceso de la cola"""
-        if process in self.ready_queue:
-            self.ready_queue.remove(process)
+        if self._queued.pop(process.pid, None) is not None:
+            # Compactar cuando las lapidas superan a las entradas vigentes
+            if len(self.ready_queue) > 2 * len(self._queued) + 16:
+                self.ready_queue = deque(
+                    (turn, proc) for turn, proc in self.ready_queue
+                    if self._queued.get(proc.pid) == turn
+                )